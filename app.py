@@ -1,9 +1,27 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
 import subprocess
 import platform
+import signal
+import threading
+import time
+import uuid
+import queue
+import heapq
+import ast
+import configparser
+import argparse
+import http.client
+import socket
+import sqlite3
+import hmac
+import ipaddress
+import re
+import atexit
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 if platform.system() == 'Windows':
@@ -21,6 +39,69 @@ CORS(app)
 
 PROJECTS_FILE = 'projects.json'
 SETTINGS_FILE = 'settings.json'
+OPERATION_STATS_FILE = 'operation_stats.json'
+
+# Timeouts (seconds) used until a project has enough recorded successful runs
+DEFAULT_GIT_TIMEOUTS = {
+    'remote': 10,
+    'status': 10,
+    'checkout': 30,
+    'pull': 60,
+    'clone': 300,
+    'search': 30,
+}
+MIN_GIT_TIMEOUT = 3
+MAX_GIT_TIMEOUT = 1800
+TIMEOUT_HISTORY_SIZE = 20
+TIMEOUT_MIN_SAMPLES = 3
+TIMEOUT_MULTIPLIER = 4
+# Adaptive timeouts never exceed this multiple of the default (or of the median run, if larger)
+TIMEOUT_GROWTH_LIMIT = 3
+# Clone destinations are new every time, so all clones share one history
+CLONE_STATS_KEY = '*clone*'
+OPERATION_STATS_SAVE_INTERVAL = 10
+
+MODULE_INDEX_FILE = 'module_index.json'
+MODULE_INDEX_REFRESH_INTERVAL = 5
+MANIFEST_NAMES = ('__manifest__.py', '__openerp__.py')
+
+BULK_WORKERS = 8
+
+NODE_DEFAULT_TIMEOUT = 10
+# Extra time the central instance waits on top of the node's own worst-case git timeouts
+NODE_TIMEOUT_MARGIN = 30
+NODE_POOL_SIZE = 4
+NODE_WORKERS = 16
+NODE_FAILURE_BACKOFF = 30
+NODE_FAILURE_THRESHOLD = 3
+AGENT_TOKEN = os.environ.get('GPM_AGENT_TOKEN')
+# Loopback callers skip the token so the local UI keeps working; disable behind a local reverse proxy
+AGENT_TRUST_LOOPBACK = os.environ.get('GPM_AGENT_TRUST_LOOPBACK', '1') != '0'
+# Project/git calls a central instance may forward to a node; everything else (clone, open-*, nodes) stays local
+NODE_PROXY_ALLOWED = (
+    ('GET', r'node'),
+    ('GET', r'projects'),
+    ('GET', r'projects/status'),
+    ('POST', r'projects/pull'),
+    ('GET', r'projects/\d+/git-status'),
+    ('GET', r'projects/\d+/git-remote'),
+    ('GET', r'projects/\d+/status-history'),
+    ('POST', r'projects/\d+/checkout'),
+    ('POST', r'projects/\d+/pull'),
+    ('GET', r'changes'),
+)
+
+STATUS_HISTORY_FILE = 'status_history.db'
+STATUS_HISTORY_RETENTION_DAYS = 30
+STATUS_HISTORY_COMPACT_INTERVAL = 3600
+STATUS_FIELDS = ('branch', 'head', 'upstream', 'ahead', 'behind', 'staged', 'modified', 'untracked', 'conflicts', 'error')
+
+IMPORT_MAX_DEPTH = 3
+
+SEARCH_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+SEARCH_DEFAULT_MAX_PER_REPO = 100
+SEARCH_DEFAULT_MAX_RESULTS = 1000
+SEARCH_MAX_LINE_LENGTH = 500
 
 def load_settings():
     if os.path.exists(SETTINGS_FILE):
@@ -49,29 +130,263 @@ def save_projects(projects):
 def get_project_name(path):
     return os.path.basename(path.rstrip('/\\'))
 
+class GitOperationCancelled(Exception):
+    pass
+
+class GitOperationConflict(Exception):
+    pass
+
+operations = {}
+operations_lock = threading.Lock()
+operation_stats = {'data': None, 'dirty': False, 'saved': 0}
+operation_stats_lock = threading.Lock()
+operation_stats_save_lock = threading.Lock()
+
+def load_operation_stats():
+    if os.path.exists(OPERATION_STATS_FILE):
+        try:
+            with open(OPERATION_STATS_FILE, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+    return {}
+
+def save_operation_stats(stats):
+    tmp_path = OPERATION_STATS_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    os.replace(tmp_path, OPERATION_STATS_FILE)
+
+def get_operation_stats():
+    # Callers hold operation_stats_lock
+    if operation_stats['data'] is None:
+        operation_stats['data'] = load_operation_stats()
+    return operation_stats['data']
+
+def prune_operation_stats(stats, registered_paths):
+    # Callers hold operation_stats_lock; an empty project list is treated as unknown, not as "drop all"
+    if not registered_paths:
+        return
+    for key in list(stats.keys()):
+        if key != CLONE_STATS_KEY and key not in registered_paths:
+            del stats[key]
+
+def flush_operation_stats(force=False):
+    with operation_stats_lock:
+        if not operation_stats['dirty']:
+            return
+        if not force and time.monotonic() - operation_stats['saved'] < OPERATION_STATS_SAVE_INTERVAL:
+            return
+    registered_paths = {p['path'] for p in load_projects() if isinstance(p, dict) and p.get('path')}
+    with operation_stats_lock:
+        if not operation_stats['dirty']:
+            return
+        prune_operation_stats(operation_stats['data'], registered_paths)
+        snapshot = json.loads(json.dumps(operation_stats['data']))
+        operation_stats['dirty'] = False
+        operation_stats['saved'] = time.monotonic()
+    with operation_stats_save_lock:
+        try:
+            save_operation_stats(snapshot)
+        except OSError:
+            with operation_stats_lock:
+                operation_stats['dirty'] = True
+
+atexit.register(flush_operation_stats, True)
+
+def record_operation_duration(stats_key, kind, duration):
+    with operation_stats_lock:
+        history = get_operation_stats().setdefault(stats_key, {}).setdefault(kind, [])
+        history.append(round(duration, 3))
+        del history[:-TIMEOUT_HISTORY_SIZE]
+        operation_stats['dirty'] = True
+    flush_operation_stats()
+
+def get_adaptive_timeout(stats_key, kind):
+    default = DEFAULT_GIT_TIMEOUTS.get(kind, 60)
+    with operation_stats_lock:
+        history = list(get_operation_stats().get(stats_key, {}).get(kind, []))
+    if len(history) < TIMEOUT_MIN_SAMPLES:
+        return default
+    ordered = sorted(history)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    median = ordered[len(ordered) // 2]
+    limit = min(MAX_GIT_TIMEOUT, max(default, median) * TIMEOUT_GROWTH_LIMIT)
+    return max(MIN_GIT_TIMEOUT, min(limit, p95 * TIMEOUT_MULTIPLIER))
+
+def register_operation(operation):
+    with operations_lock:
+        if operation['id'] in operations:
+            raise GitOperationConflict(operation['id'])
+        operations[operation['id']] = operation
+
+def unregister_operation(operation):
+    with operations_lock:
+        if operations.get(operation['id']) is operation:
+            del operations[operation['id']]
+
+def kill_process_tree(process):
+    if process.poll() is not None:
+        return
+    try:
+        if platform.system() == 'Windows':
+            subprocess.run(
+                ['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                capture_output=True,
+                creationflags=CREATE_NO_WINDOW
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        process.kill()
+
+def start_git_process(args, cwd=None, **kwargs):
+    if platform.system() != 'Windows':
+        # Own process group so kill_process_tree() can take down ssh/credential helpers too
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(
+        ['git'] + args,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        creationflags=CREATE_NO_WINDOW,
+        **kwargs
+    )
+
+def operation_to_dict(operation):
+    return {
+        'id': operation['id'],
+        'kind': operation['kind'],
+        'path': operation['path'],
+        'command': operation['command'],
+        'timeout': operation['timeout'],
+        'elapsed': round(time.monotonic() - operation['started'], 3),
+        'cancelled': operation['cancel_event'].is_set(),
+    }
+
+def run_git(args, project_path, kind, cwd=None, operation_id=None, stats_key=None):
+    stats_key = stats_key or project_path
+    timeout = get_adaptive_timeout(stats_key, kind)
+    operation = {
+        'id': operation_id or uuid.uuid4().hex,
+        'kind': kind,
+        'path': project_path,
+        'command': ' '.join(['git'] + args),
+        'timeout': timeout,
+        'started': time.monotonic(),
+        'cancel_event': threading.Event(),
+    }
+    register_operation(operation)
+
+    try:
+        process = start_git_process(args, cwd)
+        operation['process'] = process
+        while True:
+            remaining = timeout - (time.monotonic() - operation['started'])
+            try:
+                stdout, stderr = process.communicate(timeout=max(0.01, min(0.25, remaining)))
+                break
+            except subprocess.TimeoutExpired:
+                if operation['cancel_event'].is_set():
+                    kill_process_tree(process)
+                    process.communicate()
+                    raise GitOperationCancelled(operation['id'])
+                if remaining <= 0:
+                    kill_process_tree(process)
+                    process.communicate()
+                    raise subprocess.TimeoutExpired(operation['command'], timeout)
+    finally:
+        unregister_operation(operation)
+
+    # Only successful runs shape the timeout, so hangs and fast failures don't skew it
+    if process.returncode == 0:
+        record_operation_duration(stats_key, kind, time.monotonic() - operation['started'])
+    return subprocess.CompletedProcess(['git'] + args, process.returncode, stdout, stderr)
+
+def search_project(project_id, project_path, grep_args, max_per_repo, cancel_event, active, active_lock, results):
+    if cancel_event.is_set():
+        return
+    if not os.path.isdir(project_path):
+        results.put({'type': 'error', 'project_id': project_id, 'path': project_path, 'error': 'Project path does not exist'})
+        return
+
+    started = time.monotonic()
+    timeout = get_adaptive_timeout(project_path, 'search')
+    try:
+        process = start_git_process(grep_args, project_path, encoding='utf-8', errors='replace')
+    except Exception as e:
+        results.put({'type': 'error', 'project_id': project_id, 'path': project_path, 'error': str(e)})
+        return
+
+    with active_lock:
+        active[project_id] = process
+    timer = threading.Timer(timeout, kill_process_tree, args=(process,))
+    timer.daemon = True
+    timer.start()
+
+    name = get_project_name(project_path)
+    count = 0
+    truncated = False
+    try:
+        for line in process.stdout:
+            if cancel_event.is_set():
+                break
+            parts = line.rstrip('\n').split('\0', 2)
+            if len(parts) != 3:
+                continue
+            if count >= max_per_repo:
+                truncated = True
+                break
+            count += 1
+            results.put({
+                'type': 'match',
+                'project_id': project_id,
+                'project': name,
+                'path': project_path,
+                'file': parts[0],
+                'line': int(parts[1]) if parts[1].isdigit() else None,
+                'text': parts[2][:SEARCH_MAX_LINE_LENGTH],
+            })
+    finally:
+        timer.cancel()
+        kill_process_tree(process)
+        stderr = process.stderr.read()
+        process.wait()
+        process.stdout.close()
+        process.stderr.close()
+        with active_lock:
+            active.pop(project_id, None)
+
+    elapsed = time.monotonic() - started
+    timed_out = elapsed >= timeout and not truncated
+    if cancel_event.is_set():
+        return
+    # git grep exits with 1 when nothing matched
+    if timed_out:
+        results.put({'type': 'error', 'project_id': project_id, 'path': project_path, 'error': 'Search timed out'})
+    elif not truncated and process.returncode not in (0, 1):
+        results.put({'type': 'error', 'project_id': project_id, 'path': project_path, 'error': stderr.strip() or 'git grep failed'})
+    else:
+        if not truncated:
+            record_operation_duration(project_path, 'search', elapsed)
+        results.put({'type': 'project_done', 'project_id': project_id, 'path': project_path, 'matches': count, 'truncated': truncated})
+
+def get_request_operation_id():
+    operation_id = request.headers.get('X-Operation-Id', '').strip()
+    return operation_id or None
+
 def get_git_remote_url(project_path):
     if not os.path.exists(project_path):
         return None
     
     try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=CREATE_NO_WINDOW
-        )
+        result = run_git(['remote', 'get-url', 'origin'], project_path, 'remote', cwd=project_path)
         
         if result.returncode != 0:
-            result = subprocess.run(
-                ['git', 'remote', '-v'],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=CREATE_NO_WINDOW
-            )
+            result = run_git(['remote', '-v'], project_path, 'remote', cwd=project_path)
             if result.returncode == 0 and result.stdout:
                 lines = result.stdout.strip().split('\n')
                 if lines:
@@ -102,12 +417,705 @@ def get_git_remote_url(project_path):
     except (subprocess.TimeoutExpired, Exception):
         return None
 
+def get_odoo_addons_paths(config_path):
+    if not config_path or not os.path.isfile(config_path):
+        return []
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(config_path, encoding='utf-8')
+    except (configparser.Error, OSError, UnicodeDecodeError):
+        return []
+    raw = parser.get('options', 'addons_path', fallback='')
+    config_dir = os.path.dirname(os.path.abspath(config_path))
+    paths = []
+    for item in raw.split(','):
+        item = os.path.expanduser(item.strip())
+        if not item:
+            continue
+        if not os.path.isabs(item):
+            item = os.path.join(config_dir, item)
+        paths.append(os.path.normpath(item))
+    return paths
+
+def find_manifest(module_dir):
+    for manifest_name in MANIFEST_NAMES:
+        manifest_path = os.path.join(module_dir, manifest_name)
+        if os.path.isfile(manifest_path):
+            return manifest_path
+    return None
+
+def read_manifest(module_dir, manifest_path):
+    try:
+        stat = os.stat(manifest_path)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = ast.literal_eval(f.read())
+        if not isinstance(manifest, dict):
+            manifest = {}
+        error = None
+    except (OSError, ValueError, TypeError, SyntaxError, RecursionError, UnicodeDecodeError) as e:
+        stat = None
+        manifest = {}
+        error = str(e)
+    depends = manifest.get('depends', [])
+    title = manifest.get('name')
+    version = manifest.get('version')
+    return {
+        'name': os.path.basename(module_dir.rstrip('/\\')),
+        'title': title if isinstance(title, str) else None,
+        'version': str(version) if isinstance(version, (str, int, float)) else None,
+        'depends': [d for d in depends if isinstance(d, str)] if isinstance(depends, list) else [],
+        'installable': manifest.get('installable', True) is not False,
+        'path': module_dir,
+        'manifest_mtime': stat.st_mtime if stat else None,
+        'error': error,
+    }
+
+def scan_module_root(root, previous=None):
+    previous = previous or {}
+    try:
+        root_mtime = os.stat(root).st_mtime
+    except OSError:
+        # Kept in the index so a stale addons_path entry doesn't force a rescan on every query
+        return {'mtime': None, 'subdirs': [], 'modules': {}}
+
+    old_modules = previous.get('modules', {})
+    if previous.get('mtime') == root_mtime and 'subdirs' in previous:
+        # Listing unchanged: re-check the known subdirectories for added or edited manifests
+        candidates = previous['subdirs']
+    else:
+        manifest_path = find_manifest(root)
+        if manifest_path:
+            candidates = [root]
+        else:
+            try:
+                candidates = [
+                    os.path.join(root, entry)
+                    for entry in os.listdir(root)
+                    if not entry.startswith('.') and os.path.isdir(os.path.join(root, entry))
+                ]
+            except OSError:
+                candidates = []
+
+    modules = {}
+    old_by_path = {module['path']: module for module in old_modules.values()}
+    for module_dir in candidates:
+        manifest_path = find_manifest(module_dir)
+        if not manifest_path:
+            continue
+        old = old_by_path.get(module_dir)
+        try:
+            manifest_mtime = os.stat(manifest_path).st_mtime
+        except OSError:
+            continue
+        if old and old.get('manifest_mtime') == manifest_mtime:
+            module = old
+        else:
+            module = read_manifest(module_dir, manifest_path)
+        modules[module['name']] = module
+
+    return {'mtime': root_mtime, 'subdirs': candidates, 'modules': modules}
+
+module_index = {'roots': {}, 'refreshed': 0}
+module_index_lock = threading.Lock()
+
+def load_module_index():
+    if os.path.exists(MODULE_INDEX_FILE):
+        try:
+            with open(MODULE_INDEX_FILE, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+    return {}
+
+def save_module_index(roots):
+    with open(MODULE_INDEX_FILE, 'w') as f:
+        json.dump(roots, f, indent=2)
+
+def get_module_roots():
+    roots = []
+    for project in load_projects():
+        path = project.get('path') if isinstance(project, dict) else None
+        if path:
+            roots.append((os.path.normpath(path), 'project'))
+    for path in get_odoo_addons_paths(load_settings().get('odoo_config_path')):
+        roots.append((path, 'addons_path'))
+    seen = set()
+    unique = []
+    for path, source in roots:
+        if path not in seen:
+            seen.add(path)
+            unique.append((path, source))
+    return unique
+
+def refresh_module_index(force=False):
+    with module_index_lock:
+        if not module_index['roots'] and not module_index['refreshed']:
+            module_index['roots'] = load_module_index()
+
+        current = module_index['roots']
+        fresh = time.monotonic() - module_index['refreshed'] < MODULE_INDEX_REFRESH_INTERVAL
+        if fresh and not force:
+            return current
+
+        updated = {}
+        for path, source in get_module_roots():
+            scanned = scan_module_root(path, current.get(path))
+            scanned['source'] = source
+            updated[path] = scanned
+
+        if updated != current:
+            save_module_index(updated)
+        module_index['roots'] = updated
+        module_index['refreshed'] = time.monotonic()
+        return updated
+
+def get_modules_by_name(roots):
+    project_ids = {}
+    for index, project in enumerate(load_projects()):
+        if isinstance(project, dict) and project.get('path'):
+            project_ids.setdefault(os.path.normpath(project['path']), index)
+
+    by_name = {}
+    for root, data in roots.items():
+        for name, module in data['modules'].items():
+            entry = dict(module)
+            entry.pop('manifest_mtime', None)
+            entry['root'] = root
+            entry['source'] = data.get('source')
+            entry['project_id'] = project_ids.get(root)
+            by_name.setdefault(name, []).append(entry)
+    return by_name
+
+def build_dependency_tree(name, by_name, ancestors, expanded):
+    providers = by_name.get(name, [])
+    node = {
+        'name': name,
+        'missing': not providers,
+        'path': providers[0]['path'] if providers else None,
+        'depends': [],
+    }
+    if name in ancestors:
+        node['cycle'] = True
+    elif name in expanded:
+        # Shared dependencies (base, web, ...) are only expanded the first time they appear
+        node['repeated'] = True
+    elif providers:
+        expanded.add(name)
+        node['depends'] = [
+            build_dependency_tree(dep, by_name, ancestors | {name}, expanded)
+            for dep in providers[0]['depends']
+        ]
+    return node
+
+def parse_porcelain_status(output):
+    status = {
+        'branch': None,
+        'head': None,
+        'upstream': None,
+        'ahead': 0,
+        'behind': 0,
+        'staged': 0,
+        'modified': 0,
+        'untracked': 0,
+        'conflicts': 0,
+    }
+    for line in output.splitlines():
+        if line.startswith('# branch.oid '):
+            oid = line[len('# branch.oid '):]
+            status['head'] = None if oid == '(initial)' else oid
+        elif line.startswith('# branch.head '):
+            head = line[len('# branch.head '):]
+            status['branch'] = None if head == '(detached)' else head
+        elif line.startswith('# branch.upstream '):
+            status['upstream'] = line[len('# branch.upstream '):]
+        elif line.startswith('# branch.ab '):
+            parts = line.split()
+            if len(parts) == 4:
+                status['ahead'] = int(parts[2].lstrip('+'))
+                status['behind'] = int(parts[3].lstrip('-'))
+        elif line.startswith('1 ') or line.startswith('2 '):
+            xy = line[2:4]
+            if xy[0] != '.':
+                status['staged'] += 1
+            if xy[1] != '.':
+                status['modified'] += 1
+        elif line.startswith('u '):
+            status['conflicts'] += 1
+        elif line.startswith('? '):
+            status['untracked'] += 1
+    status['dirty'] = bool(status['staged'] or status['modified'] or status['untracked'] or status['conflicts'])
+    return status
+
+status_history_lock = threading.Lock()
+status_history_state = {'initialized': False, 'compacted': 0}
+
+def open_status_history():
+    connection = sqlite3.connect(STATUS_HISTORY_FILE, timeout=10)
+    connection.row_factory = sqlite3.Row
+    if not status_history_state['initialized']:
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                taken_at REAL NOT NULL,
+                branch TEXT,
+                head TEXT,
+                upstream TEXT,
+                ahead INTEGER,
+                behind INTEGER,
+                staged INTEGER,
+                modified INTEGER,
+                untracked INTEGER,
+                conflicts INTEGER,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_path_id ON snapshots (path, id);
+            CREATE TABLE IF NOT EXISTS last_checked (
+                path TEXT PRIMARY KEY,
+                checked_at REAL NOT NULL
+            );
+        """)
+        status_history_state['initialized'] = True
+    return connection
+
+def snapshot_to_dict(row):
+    snapshot = {key: row[key] for key in ('id', 'path', 'taken_at') + STATUS_FIELDS}
+    snapshot['dirty'] = bool(row['staged'] or row['modified'] or row['untracked'] or row['conflicts'])
+    return snapshot
+
+def compact_status_history(connection, registered_paths):
+    cutoff = time.time() - STATUS_HISTORY_RETENTION_DAYS * 86400
+    # Old snapshots go, but the latest one per project is kept so the feed still knows its state
+    connection.execute(
+        'DELETE FROM snapshots WHERE taken_at < ? AND id NOT IN (SELECT MAX(id) FROM snapshots GROUP BY path)',
+        (cutoff,)
+    )
+    if not registered_paths:
+        return
+    # History of projects that were removed from the manager is dropped entirely
+    connection.execute('CREATE TEMP TABLE IF NOT EXISTS registered (path TEXT PRIMARY KEY)')
+    connection.execute('DELETE FROM registered')
+    connection.executemany('INSERT OR IGNORE INTO registered (path) VALUES (?)', [(p,) for p in registered_paths])
+    connection.execute('DELETE FROM snapshots WHERE path NOT IN (SELECT path FROM registered)')
+    connection.execute('DELETE FROM last_checked WHERE path NOT IN (SELECT path FROM registered)')
+
+def record_status_snapshot(project_path, status=None, error=None):
+    values = {field: (status or {}).get(field) for field in STATUS_FIELDS}
+    values['error'] = error
+    now = time.time()
+    registered_paths = None
+    if now - status_history_state['compacted'] > STATUS_HISTORY_COMPACT_INTERVAL:
+        registered_paths = [p['path'] for p in load_projects() if isinstance(p, dict) and p.get('path')]
+    with status_history_lock:
+        connection = open_status_history()
+        try:
+            with connection:
+                last = connection.execute(
+                    'SELECT * FROM snapshots WHERE path = ? ORDER BY id DESC LIMIT 1', (project_path,)
+                ).fetchone()
+                # Unchanged state only bumps last_checked, so the log grows with changes, not with polls
+                if last is None or any(last[field] != values[field] for field in STATUS_FIELDS):
+                    connection.execute(
+                        'INSERT INTO snapshots (path, taken_at, %s) VALUES (?, ?, %s)'
+                        % (', '.join(STATUS_FIELDS), ', '.join('?' for _ in STATUS_FIELDS)),
+                        (project_path, now) + tuple(values[field] for field in STATUS_FIELDS)
+                    )
+                connection.execute(
+                    'INSERT OR REPLACE INTO last_checked (path, checked_at) VALUES (?, ?)', (project_path, now)
+                )
+                if registered_paths is not None:
+                    compact_status_history(connection, registered_paths)
+                    status_history_state['compacted'] = now
+        finally:
+            connection.close()
+
+def try_record_status_snapshot(project_path, status=None, error=None):
+    # History is best effort: a locked or broken database must not fail the status call itself
+    try:
+        record_status_snapshot(project_path, status, error)
+    except (sqlite3.Error, OSError) as e:
+        app.logger.warning('Could not record status snapshot for %s: %s', project_path, e)
+
+def get_status_changes(since, limit):
+    with status_history_lock:
+        connection = open_status_history()
+        try:
+            rows = connection.execute(
+                """
+                SELECT s.*, c.checked_at FROM snapshots s
+                JOIN (SELECT path, MAX(id) AS id FROM snapshots WHERE id > ? GROUP BY path) latest
+                    ON s.id = latest.id
+                LEFT JOIN last_checked c ON c.path = s.path
+                ORDER BY s.id
+                LIMIT ?
+                """,
+                (since, limit)
+            ).fetchall()
+            cursor = connection.execute('SELECT COALESCE(MAX(id), 0) FROM snapshots').fetchone()[0]
+        finally:
+            connection.close()
+    return rows, cursor
+
+def get_status_history(project_path, limit):
+    with status_history_lock:
+        connection = open_status_history()
+        try:
+            return connection.execute(
+                'SELECT * FROM snapshots WHERE path = ? ORDER BY id DESC LIMIT ?', (project_path, limit)
+            ).fetchall()
+        finally:
+            connection.close()
+
+def collect_git_status(project_path, operation_id=None):
+    result = run_git(
+        ['status', '--porcelain=v2', '--branch'],
+        project_path,
+        'status',
+        cwd=project_path,
+        operation_id=operation_id
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip() or 'Not a git repository'
+        try_record_status_snapshot(project_path, error=error)
+        raise RuntimeError(error)
+    status = parse_porcelain_status(result.stdout)
+    try_record_status_snapshot(project_path, status)
+    return status
+
+def select_projects(projects, project_ids):
+    if project_ids is None:
+        return list(enumerate(projects))
+    return [(i, projects[i]) for i in project_ids]
+
+def has_unknown_project_ids(projects, project_ids):
+    return project_ids is not None and any(i < 0 or i >= len(projects) for i in project_ids)
+
+def status_project_entry(project_id, project):
+    path = project['path']
+    entry = {'project_id': project_id, 'path': path, 'name': get_project_name(path)}
+    if not os.path.exists(path):
+        entry['error'] = 'Project path does not exist'
+        return entry
+    try:
+        entry.update(collect_git_status(path))
+    except subprocess.TimeoutExpired:
+        entry['error'] = 'Git command timed out'
+    except GitOperationCancelled:
+        entry['error'] = 'Git command cancelled'
+    except Exception as e:
+        entry['error'] = str(e)
+    return entry
+
+def pull_project_entry(project_id, project):
+    path = project['path']
+    entry = {'project_id': project_id, 'path': path, 'name': get_project_name(path)}
+    if not os.path.exists(path):
+        entry['error'] = 'Project path does not exist'
+        return entry
+    try:
+        result = run_git(['pull'], path, 'pull', cwd=path)
+        if result.returncode != 0:
+            entry['error'] = 'Failed to pull changes'
+            entry['message'] = result.stderr
+        else:
+            entry['message'] = 'Successfully pulled changes'
+            entry['output'] = result.stdout
+    except subprocess.TimeoutExpired:
+        entry['error'] = 'Git command timed out'
+    except GitOperationCancelled:
+        entry['error'] = 'Git command cancelled'
+    except Exception as e:
+        entry['error'] = str(e)
+    return entry
+
+def estimate_bulk_duration(selected, kind):
+    # Worst case for run_bulk(): every project uses its full timeout, handed out in order to the workers
+    if not selected:
+        return 0
+    workers = [0.0] * min(BULK_WORKERS, len(selected))
+    for _, project in selected:
+        heapq.heapreplace(workers, workers[0] + get_adaptive_timeout(project['path'], kind))
+    return max(workers)
+
+def run_bulk(func, selected):
+    if not selected:
+        return []
+    with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(selected))) as executor:
+        return list(executor.map(lambda item: func(*item), selected))
+
+def parse_project_ids(value):
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(i, int) for i in value):
+        raise ValueError('project_ids must be a list of integers')
+    return value
+
+class NodeClient:
+    def __init__(self, name, url, token=None, timeout=NODE_DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError('Node URL must be an http(s) URL')
+        self.name = name
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def _connect(self, timeout):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=timeout)
+
+    def _acquire(self, timeout):
+        with self.lock:
+            if self.idle:
+                connection = self.idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+        return self._connect(timeout), False
+
+    def _release(self, connection):
+        with self.lock:
+            if len(self.idle) < NODE_POOL_SIZE:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+    def request(self, method, path, payload=None, timeout=None):
+        timeout = timeout or self.timeout
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['X-Agent-Token'] = self.token
+
+        while True:
+            connection, reused = self._acquire(timeout)
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers)
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                # The pooled connection was already closed by the node and the request never got through
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            try:
+                response = connection.getresponse()
+                raw = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                # The node may already have acted on the request, so only idempotent calls are resent
+                if reused and method in ('GET', 'HEAD'):
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            try:
+                data = json.loads(raw.decode('utf-8')) if raw else None
+            except ValueError:
+                data = {'error': 'Invalid JSON response from node'}
+            return response.status, data
+
+node_clients = {}
+node_clients_lock = threading.Lock()
+node_health = {}
+node_health_lock = threading.Lock()
+
+def load_nodes():
+    nodes = load_settings().get('nodes', [])
+    return [n for n in nodes if isinstance(n, dict) and n.get('name') and n.get('url')] if isinstance(nodes, list) else []
+
+def get_node_client(node):
+    with node_clients_lock:
+        client = node_clients.get(node['name'])
+        if client and client.url == node['url'] and client.token == node.get('token'):
+            return client
+        if client:
+            client.close()
+        client = NodeClient(node['name'], node['url'], node.get('token'), node.get('timeout', NODE_DEFAULT_TIMEOUT))
+        node_clients[node['name']] = client
+        return client
+
+def record_node_result(name, ok, latency, error=None, auth_failed=False):
+    with node_health_lock:
+        health = node_health.setdefault(name, {'failures': 0})
+        health['ok'] = ok
+        health['auth_failed'] = auth_failed
+        health['latency'] = round(latency, 3)
+        health['checked_at'] = time.time()
+        if ok:
+            health['failures'] = 0
+            health['last_error'] = None
+            health['last_seen'] = health['checked_at']
+        else:
+            health['failures'] += 1
+            health['last_error'] = error
+            health['failed_at'] = time.monotonic()
+
+def get_node_health(name):
+    with node_health_lock:
+        health = dict(node_health.get(name, {'failures': 0, 'ok': None}))
+    health.pop('failed_at', None)
+    return health
+
+def node_in_backoff(name):
+    with node_health_lock:
+        health = node_health.get(name)
+        if not health or health.get('failures', 0) < NODE_FAILURE_THRESHOLD:
+            return False
+        return time.monotonic() - health.get('failed_at', 0) < NODE_FAILURE_BACKOFF
+
+def call_node(node, method, path, payload=None, timeout=None, force=False):
+    result = {'node': node['name'], 'url': node['url']}
+    if not force and node_in_backoff(node['name']):
+        result['error'] = 'Node is unhealthy, skipped'
+        return result
+    started = time.monotonic()
+    try:
+        status, data = get_node_client(node).request(method, path, payload, timeout)
+    except Exception as e:
+        message = 'Node request timed out' if isinstance(e, socket.timeout) else 'Node unreachable: %s' % e
+        record_node_result(node['name'], False, time.monotonic() - started, message)
+        result['error'] = message
+        return result
+    latency = time.monotonic() - started
+    # Other 4xx mean the node answered a bad request; a rejected token means it's misconfigured
+    if status in (401, 403):
+        record_node_result(node['name'], False, latency, 'Authentication failed (HTTP %d)' % status, auth_failed=True)
+    else:
+        record_node_result(node['name'], status < 500, latency, None if status < 500 else 'HTTP %d' % status)
+    result['status_code'] = status
+    result['latency'] = round(latency, 3)
+    result['data'] = data
+    if status >= 400:
+        result['error'] = (data or {}).get('error', 'HTTP %d' % status) if isinstance(data, dict) else 'HTTP %d' % status
+    return result
+
+def fan_out_nodes(nodes, func):
+    if not nodes:
+        return []
+    with ThreadPoolExecutor(max_workers=min(NODE_WORKERS, len(nodes))) as executor:
+        return list(executor.map(func, nodes))
+
+def fan_out(nodes, method, path, payload=None, timeout=None, force=False):
+    return fan_out_nodes(nodes, lambda node: call_node(node, method, path, payload, timeout, force))
+
+def pull_node(node, path, payload):
+    # Ask the node how long its bulk pull can take, so we never give up while it is still pulling
+    info = call_node(node, 'GET', '/api/node')
+    if 'error' in info:
+        return info
+    bulk_timeout = info['data'].get('bulk_pull_timeout') if isinstance(info['data'], dict) else None
+    if not isinstance(bulk_timeout, (int, float)):
+        bulk_timeout = MAX_GIT_TIMEOUT
+    return call_node(node, 'POST', path, payload, bulk_timeout + NODE_TIMEOUT_MARGIN)
+
+def select_nodes(names):
+    nodes = load_nodes()
+    if names is None:
+        return nodes
+    return [n for n in nodes if n['name'] in names]
+
+def is_proxy_allowed(method, subpath):
+    return any(method == allowed_method and re.fullmatch(pattern, subpath)
+               for allowed_method, pattern in NODE_PROXY_ALLOWED)
+
+def central_token_error():
+    # Node tokens are pointless if anyone can reach this instance and act through it
+    if not AGENT_TOKEN:
+        return jsonify({'error': 'Set GPM_AGENT_TOKEN on this instance before using remote nodes'}), 403
+    return None
+
+def get_node_info():
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.system(),
+        'projects': len(load_projects()),
+        'bulk_pull_timeout': round(estimate_bulk_duration(select_projects(load_projects(), None), 'pull'), 1),
+    }
+
+def is_loopback_address(address):
+    try:
+        ip = ipaddress.ip_address(address or '')
+    except ValueError:
+        return False
+    if getattr(ip, 'ipv4_mapped', None):
+        ip = ip.ipv4_mapped
+    return ip.is_loopback
+
+@app.before_request
+def check_agent_token():
+    if not AGENT_TOKEN or not request.path.startswith('/api/'):
+        return None
+    if AGENT_TRUST_LOOPBACK and is_loopback_address(request.remote_addr):
+        return None
+    token = request.headers.get('X-Agent-Token', '')
+    if not hmac.compare_digest(token.encode('utf-8'), AGENT_TOKEN.encode('utf-8')):
+        return jsonify({'error': 'Invalid agent token'}), 401
+    return None
+
+def find_git_repositories(parent_dir, depth):
+    found = []
+    try:
+        entries = sorted(os.listdir(parent_dir))
+    except OSError:
+        return found
+    for entry in entries:
+        if entry.startswith('.'):
+            continue
+        path = os.path.join(parent_dir, entry)
+        if not os.path.isdir(path):
+            continue
+        if os.path.exists(os.path.join(path, '.git')):
+            found.append(path)
+        elif depth > 1:
+            found.extend(find_git_repositories(path, depth - 1))
+    return found
+
+def validate_import_path(path):
+    entry = {'path': path}
+    if not os.path.exists(path):
+        entry['status'] = 'error'
+        entry['error'] = 'Path does not exist'
+    elif not os.path.isdir(path):
+        entry['status'] = 'error'
+        entry['error'] = 'Path must be a directory'
+    else:
+        entry['status'] = 'added'
+        entry['name'] = get_project_name(path)
+        git_remote_url = get_git_remote_url(path)
+        if git_remote_url:
+            entry['git_remote_url'] = git_remote_url
+    return entry
+
 @app.route('/')
 def index():
     return send_from_directory(STATIC_DIR, 'index.html')
 
-@app.route('/api/projects', methods=['GET'])
-def get_projects():
+def list_valid_projects():
     projects = load_projects()
     valid_projects = []
     updated = False
@@ -126,7 +1134,11 @@ def get_projects():
             updated = True
     if updated:
         save_projects(valid_projects)
-    return jsonify(valid_projects)
+    return valid_projects
+
+@app.route('/api/projects', methods=['GET'])
+def get_projects():
+    return jsonify(list_valid_projects())
 
 @app.route('/api/projects', methods=['POST'])
 def add_project():
@@ -167,6 +1179,72 @@ def add_project():
     
     return jsonify(response_data), 201
 
+@app.route('/api/projects/batch', methods=['POST'])
+def batch_add_projects():
+    data = request.json or {}
+    paths = data.get('paths', [])
+    parent_dir = data.get('parent_dir') or ''
+    depth = data.get('depth', 1)
+
+    if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+        return jsonify({'error': 'paths must be a list of strings'}), 400
+    if not isinstance(parent_dir, str):
+        return jsonify({'error': 'parent_dir must be a string'}), 400
+    parent_dir = parent_dir.strip()
+    if not isinstance(depth, int) or depth < 1 or depth > IMPORT_MAX_DEPTH:
+        return jsonify({'error': f'depth must be between 1 and {IMPORT_MAX_DEPTH}'}), 400
+    if not paths and not parent_dir:
+        return jsonify({'error': 'paths or parent_dir is required'}), 400
+
+    candidates = [os.path.normpath(p.strip()) for p in paths if p.strip()]
+    if parent_dir:
+        parent_dir = os.path.normpath(parent_dir)
+        if not os.path.isdir(parent_dir):
+            return jsonify({'error': 'parent_dir does not exist or is not a directory'}), 400
+        candidates.extend(find_git_repositories(parent_dir, depth))
+
+    existing = {p.get('path') for p in load_projects() if isinstance(p, dict)}
+    results = [None] * len(candidates)
+    to_validate = []
+    seen = set()
+    for index, path in enumerate(candidates):
+        if path in existing:
+            results[index] = {'path': path, 'status': 'exists', 'error': 'Project already exists'}
+        elif path in seen:
+            results[index] = {'path': path, 'status': 'duplicate', 'error': 'Path listed more than once'}
+        else:
+            seen.add(path)
+            to_validate.append(index)
+
+    if to_validate:
+        with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(to_validate))) as executor:
+            validated = executor.map(validate_import_path, [candidates[i] for i in to_validate])
+            for index, entry in zip(to_validate, validated):
+                results[index] = entry
+
+    # Remote lookups can take a while; re-read so projects added or deleted meanwhile aren't lost
+    projects = load_projects()
+    existing = {p.get('path') for p in projects if isinstance(p, dict)}
+    for entry in results:
+        if entry['status'] == 'added' and entry['path'] in existing:
+            entry['status'] = 'exists'
+            entry['error'] = 'Project already exists'
+
+    added = [entry for entry in results if entry['status'] == 'added']
+    for entry in added:
+        project_data = {'path': entry['path']}
+        if entry.get('git_remote_url'):
+            project_data['git_remote_url'] = entry['git_remote_url']
+        projects.append(project_data)
+    if added:
+        save_projects(projects)
+
+    return jsonify({
+        'added': len(added),
+        'skipped': len(results) - len(added),
+        'results': results
+    }), 201 if added else 200
+
 @app.route('/api/projects/clone', methods=['POST'])
 def clone_project():
     data = request.json
@@ -201,12 +1279,12 @@ def clone_project():
         return jsonify({'error': f'Directory {project_path} already exists'}), 400
     
     try:
-        result = subprocess.run(
-            ['git', 'clone', repository_url, project_path],
-            capture_output=True,
-            text=True,
-            timeout=300,
-            creationflags=CREATE_NO_WINDOW
+        result = run_git(
+            ['clone', repository_url, project_path],
+            project_path,
+            'clone',
+            stats_key=CLONE_STATS_KEY,
+            operation_id=get_request_operation_id()
         )
         
         if result.returncode != 0:
@@ -235,6 +1313,10 @@ def clone_project():
         
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Clone operation timed out'}), 500
+    except GitOperationCancelled:
+        return jsonify({'error': 'Clone operation cancelled'}), 409
+    except GitOperationConflict:
+        return jsonify({'error': 'Operation id already in use'}), 409
     except Exception as e:
         return jsonify({'error': f'Error cloning repository: {str(e)}'}), 500
 
@@ -317,32 +1399,28 @@ def git_status(project_id):
         return jsonify({'error': 'Project path does not exist'}), 404
     
     try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=CREATE_NO_WINDOW
-        )
-        current_branch = result.stdout.strip() if result.returncode == 0 else 'Not a git repository'
+        operation_id = get_request_operation_id()
+        try:
+            summary = collect_git_status(project_path, operation_id=operation_id)
+            current_branch = summary['branch'] or ''
+        except RuntimeError:
+            summary = None
+            current_branch = 'Not a git repository'
         
-        status_result = subprocess.run(
-            ['git', 'status'],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=CREATE_NO_WINDOW
-        )
+        status_result = run_git(['status'], project_path, 'status', cwd=project_path, operation_id=operation_id)
         status_output = status_result.stdout if status_result.returncode == 0 else 'Not a git repository'
         
         return jsonify({
             'branch': current_branch,
-            'status': status_output
+            'status': status_output,
+            'summary': summary
         })
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Git command timed out'}), 500
+    except GitOperationCancelled:
+        return jsonify({'error': 'Git command cancelled'}), 409
+    except GitOperationConflict:
+        return jsonify({'error': 'Operation id already in use'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -365,13 +1443,12 @@ def git_checkout(project_id):
         return jsonify({'error': 'Project path does not exist'}), 404
     
     try:
-        result = subprocess.run(
-            ['git', 'checkout', branch_name],
+        result = run_git(
+            ['checkout', branch_name],
+            project_path,
+            'checkout',
             cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            creationflags=CREATE_NO_WINDOW
+            operation_id=get_request_operation_id()
         )
         
         if result.returncode != 0:
@@ -386,6 +1463,10 @@ def git_checkout(project_id):
         })
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Git command timed out'}), 500
+    except GitOperationCancelled:
+        return jsonify({'error': 'Git command cancelled'}), 409
+    except GitOperationConflict:
+        return jsonify({'error': 'Operation id already in use'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -402,13 +1483,12 @@ def git_pull(project_id):
         return jsonify({'error': 'Project path does not exist'}), 404
     
     try:
-        result = subprocess.run(
-            ['git', 'pull'],
+        result = run_git(
+            ['pull'],
+            project_path,
+            'pull',
             cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=60,
-            creationflags=CREATE_NO_WINDOW
+            operation_id=get_request_operation_id()
         )
         
         if result.returncode != 0:
@@ -423,6 +1503,10 @@ def git_pull(project_id):
         })
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Git command timed out'}), 500
+    except GitOperationCancelled:
+        return jsonify({'error': 'Git command cancelled'}), 409
+    except GitOperationConflict:
+        return jsonify({'error': 'Operation id already in use'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -439,24 +1523,10 @@ def get_git_remote(project_id):
         return jsonify({'error': 'Project path does not exist'}), 404
     
     try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=CREATE_NO_WINDOW
-        )
+        result = run_git(['remote', 'get-url', 'origin'], project_path, 'remote', cwd=project_path)
         
         if result.returncode != 0:
-            result = subprocess.run(
-                ['git', 'remote', '-v'],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=CREATE_NO_WINDOW
-            )
+            result = run_git(['remote', '-v'], project_path, 'remote', cwd=project_path)
             if result.returncode == 0 and result.stdout:
                 lines = result.stdout.strip().split('\n')
                 if lines:
@@ -489,9 +1559,361 @@ def get_git_remote(project_id):
         
     except subprocess.TimeoutExpired:
         return jsonify({'error': 'Git command timed out'}), 500
+    except GitOperationCancelled:
+        return jsonify({'error': 'Git command cancelled'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/projects/status', methods=['GET'])
+def bulk_git_status():
+    projects = load_projects()
+    ids = request.args.get('projects', '').strip()
+    try:
+        project_ids = [int(i) for i in ids.split(',') if i.strip()] if ids else None
+    except ValueError:
+        return jsonify({'error': 'projects must be a comma-separated list of project ids'}), 400
+    if has_unknown_project_ids(projects, project_ids):
+        return jsonify({'error': 'Project not found'}), 404
+    return jsonify(run_bulk(status_project_entry, select_projects(projects, project_ids)))
+
+@app.route('/api/projects/pull', methods=['POST'])
+def bulk_git_pull():
+    data = request.json or {}
+    try:
+        project_ids = parse_project_ids(data.get('project_ids'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    projects = load_projects()
+    if has_unknown_project_ids(projects, project_ids):
+        return jsonify({'error': 'Project not found'}), 404
+    return jsonify(run_bulk(pull_project_entry, select_projects(projects, project_ids)))
+
+@app.route('/api/changes', methods=['GET'])
+def status_changes():
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 1000))
+    except ValueError:
+        return jsonify({'error': 'since and limit must be integers'}), 400
+    if since < 0 or limit < 1:
+        return jsonify({'error': 'since must be >= 0 and limit positive'}), 400
+
+    rows, cursor = get_status_changes(since, limit)
+    project_ids = {}
+    for index, project in enumerate(load_projects()):
+        if isinstance(project, dict) and project.get('path'):
+            project_ids.setdefault(project['path'], index)
+
+    changes = []
+    for row in rows:
+        change = snapshot_to_dict(row)
+        change['checked_at'] = row['checked_at']
+        change['name'] = get_project_name(row['path'])
+        change['project_id'] = project_ids.get(row['path'])
+        changes.append(change)
+    # When the page was cut short, resume from the last returned change instead of the head
+    if len(rows) == limit:
+        cursor = rows[-1]['id']
+    return jsonify({'cursor': cursor, 'changes': changes})
+
+@app.route('/api/projects/<int:project_id>/status-history', methods=['GET'])
+def project_status_history(project_id):
+    projects = load_projects()
+    if project_id < 0 or project_id >= len(projects):
+        return jsonify({'error': 'Project not found'}), 404
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    rows = get_status_history(projects[project_id]['path'], max(1, limit))
+    return jsonify([snapshot_to_dict(row) for row in rows])
+
+@app.route('/api/node', methods=['GET'])
+def node_info():
+    return jsonify(get_node_info())
+
+@app.route('/api/nodes', methods=['GET'])
+def list_nodes():
+    nodes = []
+    for node in load_nodes():
+        nodes.append({
+            'name': node['name'],
+            'url': node['url'],
+            'timeout': node.get('timeout', NODE_DEFAULT_TIMEOUT),
+            'health': get_node_health(node['name']),
+        })
+    return jsonify(nodes)
+
+@app.route('/api/nodes', methods=['POST'])
+def add_node():
+    token_error = central_token_error()
+    if token_error:
+        return token_error
+
+    data = request.json or {}
+    name = data.get('name', '')
+    url = data.get('url', '')
+    token = data.get('token')
+    timeout = data.get('timeout', NODE_DEFAULT_TIMEOUT)
+
+    if not isinstance(name, str) or not isinstance(url, str):
+        return jsonify({'error': 'name and url must be strings'}), 400
+    if token is not None and not isinstance(token, str):
+        return jsonify({'error': 'token must be a string'}), 400
+    name = name.strip()
+    url = url.strip().rstrip('/')
+    if not name or not url:
+        return jsonify({'error': 'name and url are required'}), 400
+    if name == 'local':
+        return jsonify({'error': '"local" is reserved for this instance'}), 400
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+        return jsonify({'error': 'timeout must be a positive number'}), 400
+    try:
+        NodeClient(name, url)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    settings = load_settings()
+    nodes = [n for n in settings.get('nodes', []) if isinstance(n, dict)]
+    if any(n.get('name') == name for n in nodes):
+        return jsonify({'error': 'Node already exists'}), 400
+
+    node = {'name': name, 'url': url, 'timeout': timeout}
+    if token:
+        node['token'] = token
+    nodes.append(node)
+    settings['nodes'] = nodes
+    save_settings(settings)
+    return jsonify({'name': name, 'url': url, 'timeout': timeout}), 201
+
+@app.route('/api/nodes/<name>', methods=['DELETE'])
+def delete_node(name):
+    settings = load_settings()
+    nodes = [n for n in settings.get('nodes', []) if isinstance(n, dict)]
+    remaining = [n for n in nodes if n.get('name') != name]
+    if len(remaining) == len(nodes):
+        return jsonify({'error': 'Node not found'}), 404
+    settings['nodes'] = remaining
+    save_settings(settings)
+    with node_clients_lock:
+        client = node_clients.pop(name, None)
+    if client:
+        client.close()
+    with node_health_lock:
+        node_health.pop(name, None)
+    return jsonify({'message': 'Node deleted'}), 200
+
+@app.route('/api/nodes/health', methods=['GET'])
+def nodes_health():
+    results = fan_out(load_nodes(), 'GET', '/api/node', force=True)
+    for result in results:
+        result['health'] = get_node_health(result['node'])
+    return jsonify(results)
+
+@app.route('/api/nodes/<name>/proxy/<path:subpath>', methods=['GET', 'POST'])
+def proxy_node(name, subpath):
+    token_error = central_token_error()
+    if token_error:
+        return token_error
+    if not is_proxy_allowed(request.method, subpath):
+        return jsonify({'error': 'This endpoint cannot be forwarded to a node'}), 403
+    node = next((n for n in load_nodes() if n['name'] == name), None)
+    if not node:
+        return jsonify({'error': 'Node not found'}), 404
+    path = '/api/' + subpath
+    if request.query_string:
+        path += '?' + request.query_string.decode('utf-8')
+    payload = request.get_json(silent=True)
+    if subpath == 'projects/pull':
+        result = pull_node(node, path, payload)
+    else:
+        # A single git call on the node never runs longer than MAX_GIT_TIMEOUT
+        timeout = MAX_GIT_TIMEOUT + NODE_TIMEOUT_MARGIN if request.method != 'GET' else None
+        result = call_node(node, request.method, path, payload, timeout, force=True)
+    if 'status_code' not in result:
+        return jsonify({'error': result['error']}), 502
+    return jsonify(result['data']), result['status_code']
+
+def fleet_request(local_func, node_func):
+    token_error = central_token_error()
+    if token_error:
+        return token_error
+
+    data = request.get_json(silent=True) or {}
+    names = data.get('nodes')
+    if names is None and request.args.get('nodes'):
+        names = [n for n in request.args.get('nodes').split(',') if n]
+    if names is not None and not isinstance(names, list):
+        return jsonify({'error': 'nodes must be a list of node names'}), 400
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        local = executor.submit(local_func) if names is None or 'local' in names else None
+        results = fan_out_nodes(select_nodes(names), node_func)
+        if local:
+            results.insert(0, {'node': 'local', 'url': None, 'status_code': 200, 'data': local.result()})
+    return jsonify(results)
+
+@app.route('/api/fleet/projects', methods=['GET'])
+def fleet_projects():
+    return fleet_request(list_valid_projects, lambda node: call_node(node, 'GET', '/api/projects'))
+
+@app.route('/api/fleet/status', methods=['GET'])
+def fleet_status():
+    projects = load_projects()
+    return fleet_request(
+        lambda: run_bulk(status_project_entry, select_projects(projects, None)),
+        lambda node: call_node(node, 'GET', '/api/projects/status')
+    )
+
+@app.route('/api/fleet/pull', methods=['POST'])
+def fleet_pull():
+    projects = load_projects()
+    return fleet_request(
+        lambda: run_bulk(pull_project_entry, select_projects(projects, None)),
+        lambda node: pull_node(node, '/api/projects/pull', {})
+    )
+
+@app.route('/api/operations', methods=['GET'])
+def list_operations():
+    with operations_lock:
+        running = [operation_to_dict(op) for op in operations.values()]
+    return jsonify(running)
+
+@app.route('/api/operations/<operation_id>/cancel', methods=['POST'])
+def cancel_operation(operation_id):
+    with operations_lock:
+        operation = operations.get(operation_id)
+        if not operation:
+            return jsonify({'error': 'Operation not found'}), 404
+        operation['cancel_event'].set()
+        data = operation_to_dict(operation)
+    return jsonify({'message': 'Cancellation requested', 'operation': data}), 202
+
+@app.route('/api/search', methods=['GET'])
+def search_projects():
+    pattern = request.args.get('q', '')
+    mode = request.args.get('mode', 'fixed')
+    output_format = request.args.get('format', 'ndjson')
+    ignore_case = request.args.get('ignore_case', '').lower() in ('1', 'true', 'yes')
+    pathspecs = [p for p in request.args.getlist('pathspec') if p.strip()]
+
+    if not pattern:
+        return jsonify({'error': 'Query parameter "q" is required'}), 400
+    if mode not in ('fixed', 'regex'):
+        return jsonify({'error': 'mode must be "fixed" or "regex"'}), 400
+    if output_format not in ('ndjson', 'sse'):
+        return jsonify({'error': 'format must be "ndjson" or "sse"'}), 400
+
+    try:
+        max_per_repo = int(request.args.get('max_per_repo', SEARCH_DEFAULT_MAX_PER_REPO))
+        max_results = int(request.args.get('max_results', SEARCH_DEFAULT_MAX_RESULTS))
+    except ValueError:
+        return jsonify({'error': 'max_per_repo and max_results must be integers'}), 400
+    if max_per_repo < 1 or max_results < 1:
+        return jsonify({'error': 'max_per_repo and max_results must be positive'}), 400
+
+    projects = load_projects()
+    selected = request.args.get('projects', '').strip()
+    if selected:
+        try:
+            project_ids = [int(p) for p in selected.split(',') if p.strip()]
+        except ValueError:
+            return jsonify({'error': 'projects must be a comma-separated list of project ids'}), 400
+        if any(i < 0 or i >= len(projects) for i in project_ids):
+            return jsonify({'error': 'Project not found'}), 404
+    else:
+        project_ids = list(range(len(projects)))
+
+    grep_args = ['grep', '-z', '-n', '-I', '--no-color', '-F' if mode == 'fixed' else '-E']
+    if ignore_case:
+        grep_args.append('-i')
+    grep_args += ['-e', pattern, '--'] + pathspecs
+
+    operation = {
+        'id': get_request_operation_id() or request.args.get('operation_id') or uuid.uuid4().hex,
+        'kind': 'search',
+        'path': None,
+        'command': ' '.join(['git'] + grep_args),
+        'timeout': None,
+        'started': time.monotonic(),
+        'cancel_event': threading.Event(),
+    }
+    cancel_event = operation['cancel_event']
+
+    def format_event(payload):
+        line = json.dumps(payload)
+        if output_format == 'sse':
+            return 'event: %s\ndata: %s\n\n' % (payload['type'], line)
+        return line + '\n'
+
+    def generate():
+        results = queue.Queue()
+        active = {}
+        active_lock = threading.Lock()
+        executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS)
+
+        total = 0
+        finished = 0
+        stopped = None
+        try:
+            yield format_event({'type': 'start', 'operation_id': operation['id'], 'projects': len(project_ids)})
+            futures = [
+                executor.submit(
+                    search_project, project_id, projects[project_id]['path'], grep_args,
+                    max_per_repo, cancel_event, active, active_lock, results
+                )
+                for project_id in project_ids
+            ]
+            while finished < len(futures):
+                if cancel_event.is_set():
+                    stopped = 'cancelled'
+                    break
+                try:
+                    item = results.get(timeout=0.25)
+                except queue.Empty:
+                    if all(f.done() for f in futures) and results.empty():
+                        break
+                    continue
+                if item['type'] == 'match':
+                    total += 1
+                elif item['type'] in ('project_done', 'error'):
+                    finished += 1
+                yield format_event(item)
+                if total >= max_results:
+                    stopped = 'max_results'
+                    break
+        finally:
+            cancel_event.set()
+            with active_lock:
+                for process in list(active.values()):
+                    kill_process_tree(process)
+            executor.shutdown(wait=False)
+            unregister_operation(operation)
+
+        yield format_event({
+            'type': 'done',
+            'operation_id': operation['id'],
+            'matches': total,
+            'projects_finished': finished,
+            'stopped': stopped,
+            'elapsed': round(time.monotonic() - operation['started'], 3),
+        })
+
+    try:
+        register_operation(operation)
+    except GitOperationConflict:
+        return jsonify({'error': 'Operation id already in use'}), 409
+
+    mimetype = 'text/event-stream' if output_format == 'sse' else 'application/x-ndjson'
+    response = Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Cache-Control': 'no-cache', 'X-Operation-Id': operation['id']}
+    )
+    # The generator's cleanup never runs if the client goes away before streaming starts
+    response.call_on_close(lambda: unregister_operation(operation))
+    return response
+
 @app.route('/api/projects/<int:project_id>/open-terminal', methods=['POST'])
 def open_terminal(project_id):
     projects = load_projects()
@@ -715,6 +2137,43 @@ def set_odoo_config_path():
 
     return jsonify({'message': 'Odoo config path saved', 'odoo_config_path': path}), 200
 
+@app.route('/api/modules', methods=['GET'])
+def list_modules():
+    by_name = get_modules_by_name(refresh_module_index())
+    return jsonify([
+        {'name': name, 'providers': providers}
+        for name, providers in sorted(by_name.items())
+    ])
+
+@app.route('/api/modules/refresh', methods=['POST'])
+def refresh_modules():
+    roots = refresh_module_index(force=True)
+    module_count = sum(len(data['modules']) for data in roots.values())
+    return jsonify({'message': 'Module index refreshed', 'roots': len(roots), 'modules': module_count}), 200
+
+@app.route('/api/modules/duplicates', methods=['GET'])
+def duplicate_modules():
+    by_name = get_modules_by_name(refresh_module_index())
+    return jsonify([
+        {'name': name, 'providers': providers}
+        for name, providers in sorted(by_name.items())
+        if len(providers) > 1
+    ])
+
+@app.route('/api/modules/<module_name>', methods=['GET'])
+def get_module(module_name):
+    providers = get_modules_by_name(refresh_module_index()).get(module_name)
+    if not providers:
+        return jsonify({'error': 'Module not found'}), 404
+    return jsonify({'name': module_name, 'providers': providers})
+
+@app.route('/api/modules/<module_name>/dependencies', methods=['GET'])
+def get_module_dependencies(module_name):
+    by_name = get_modules_by_name(refresh_module_index())
+    if module_name not in by_name:
+        return jsonify({'error': 'Module not found'}), 404
+    return jsonify(build_dependency_tree(module_name, by_name, frozenset(), set()))
+
 @app.route('/api/path/resolve', methods=['POST'])
 def resolve_path():
     data = request.json
@@ -780,4 +2239,17 @@ def resolve_path():
     })
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    parser = argparse.ArgumentParser(description='Git Project Manager')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('GPM_PORT', 5000)))
+    parser.add_argument('--waitress', action='store_true',
+                        help='Serve with waitress (keep-alive connections for central instances)')
+    args = parser.parse_args()
+    if args.waitress:
+        try:
+            from waitress import serve
+        except ImportError:
+            parser.error('waitress is not installed (pip install waitress)')
+        serve(app, host=args.host, port=args.port)
+    else:
+        app.run(debug=True, host=args.host, port=args.port, threaded=True)